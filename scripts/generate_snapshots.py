@@ -1,19 +1,70 @@
 #!/usr/bin/env python3
 import json
-from collections import namedtuple
+import math
+import os
+import pathlib
+from collections import deque, namedtuple
 from dataclasses import dataclass
+from importlib.util import find_spec
 
 from tabulate import tabulate
 
 try:
-    import numpy as np  # type: ignore
+    import orjson  # type: ignore
 except ImportError:  # pragma: no cover - optional dependency
-    np = None
+    orjson = None
 
-try:
-    import pandas as pd  # type: ignore
-except ImportError:  # pragma: no cover - optional dependency
-    pd = None
+# numpy and pandas are optional and slow to import, so they are only imported
+# once a case that needs them is registered. The _ensure_* helpers return False
+# when the import fails, and those cases are then skipped.
+np = None
+pd = None
+# isinstance(value, ()) is always False, so these are safe without numpy.
+_NDARRAY = ()
+_NUMPY_SCALAR = ()
+
+
+def _ensure_numpy():
+    global np, _NDARRAY, _NUMPY_SCALAR
+    if np is None:
+        try:
+            import numpy  # type: ignore
+        except ImportError:  # pragma: no cover - optional dependency
+            return False
+
+        np = numpy
+        _NDARRAY = numpy.ndarray
+        _NUMPY_SCALAR = numpy.generic
+    return True
+
+
+def _ensure_pandas():
+    global pd
+    if pd is None:
+        # pandas depends on numpy anyway
+        if not _ensure_numpy():
+            return False
+        try:
+            import pandas  # type: ignore
+        except ImportError:  # pragma: no cover - optional dependency
+            return False
+
+        pd = pandas
+    return True
+
+
+# Comma-separated case names; when set, only those cases are regenerated.
+_FILTER = os.environ.get("SNAPSHOT_FILTER", "")
+WANTED = frozenset(name.strip() for name in _FILTER.split(",")) - {""} or None
+
+
+def wanted(*names):
+    return WANTED is None or not WANTED.isdisjoint(names)
+
+
+# Cases that are only registered when their optional dependency imports.
+PANDAS_CASES = ("dataframe_multiindex_grid", "dataframe_index_label_plain")
+NUMPY_CASES = ("numpy_array_plain", "numpy_recarray_keys_plain")
 
 
 def to_json_kwargs(kwargs):
@@ -21,201 +72,346 @@ def to_json_kwargs(kwargs):
     for key, value in kwargs.items():
         if isinstance(value, tuple):
             result[key] = list(value)
-        elif isinstance(value, np.ndarray):  # type: ignore
+        elif isinstance(value, _NDARRAY):
             result[key] = value.tolist()
         else:
             result[key] = value
     return result
 
 
-CASES = {
-    "plain_simple": {
-        "data": [
-            ["Sun", "696000", "1989100000"],
-            ["Earth", "6371", "5973.6"],
-            ["Moon", "1737", "73.5"],
-            ["Mars", "3390", "641.85"],
-        ],
-        "kwargs": {"tablefmt": "plain"},
-    },
-    "simple_with_headers": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "simple"},
-    },
-    "pipe_alignment": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {
-            "headers": "firstrow",
-            "tablefmt": "pipe",
-            "colalign": ("left", "right"),
-        },
-    },
-    "grid_rowalign": {
-        "data": [
-            ["Name", "Description"],
-            ["Mercury", "nearest\nplanet"],
-            ["Venus", "second\nplanet"],
-        ],
-        "kwargs": {"headers": "firstrow", "tablefmt": "grid", "rowalign": "bottom"},
-    },
-    "github_multiline": {
-        "data": [["Name", "Quote"], ["Alice", "Hello\nWorld"], ["Bob", "Hi"]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "github"},
-    },
-    "orgtbl_numeric": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "orgtbl"},
-    },
-    "psql_numbers": {
-        "data": [["planet", "radius"], ["Mercury", 2440], ["Venus", 6052]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "psql"},
-    },
-    "html_simple": {
-        "data": [["Name", "Score"], ["Alice", 1], ["Bob", 2]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "html"},
-    },
-    "unsafehtml_simple": {
-        "data": [["Name", "Score"], ["<b>Alice</b>", 10], ["<i>Bob</i>", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "unsafehtml"},
-    },
-    "latex_table": {
-        "data": [["Planet", "Radius"], ["Mercury", 2440], ["Venus", 6052]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "latex"},
-    },
-    "latex_booktabs": {
-        "data": [["Planet", "Radius"], ["Mercury", 2440], ["Venus", 6052]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "latex_booktabs"},
-    },
-    "grid_maxcolwidth": {
-        "data": [
-            ["Name", "Description"],
-            ["Mercury", "Nearest planet to the Sun"],
-            ["Venus", "Has a thick atmosphere"],
-        ],
-        "kwargs": {
-            "headers": "firstrow",
-            "tablefmt": "grid",
-            "maxcolwidths": [None, 10],
-        },
-    },
-    "grid_disable_numparse": {
-        "data": [["Region", "Value"], ["EU", "42992e1"], ["US", "1000"]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "grid", "disable_numparse": [1]},
-    },
-    "pipe_rowalign_mixed": {
-        "data": [
-            ["Name", "Description"],
-            ["Mercury", "nearest\nplanet"],
-            ["Venus", "second\nplanet"],
-        ],
-        "kwargs": {
-            "headers": "firstrow",
-            "tablefmt": "pipe",
-            "rowalign": ["top", "bottom"],
-        },
-    },
-    "pipe_disable_numparse": {
-        "data": [["Region", "Value"], ["EU", "42992e1"], ["US", "1000"]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "pipe", "disable_numparse": [1]},
-    },
-    "plain_showindex": {
-        "data": [["Sun", "696000"], ["Earth", "6371"]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "plain", "showindex": "always"},
-    },
-    "plain_colglobal_right": {
-        "data": [["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"tablefmt": "plain", "colalign": ("right", "right")},
-    },
-    "ansi_plain": {
-        "data": [
-            ["Name", "Value"],
-            ["\u001b[31mRed\u001b[0m", 10],
-            ["Plain", 5],
-        ],
-        "kwargs": {"headers": "firstrow", "tablefmt": "plain"},
-    },
-    "wide_grid": {
-        "data": [["Name", "Note"], ["寿司", "おいしい"], ["カレー", "辛い"]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "grid"},
-    },
-    "plain_preserve_whitespace": {
-        "data": [["Name", "Value"], ["  Alice", " 10"], ["Bob  ", "5"]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "plain"},
-    },
-    "mediawiki_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "mediawiki"},
-    },
-    "textile_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "textile"},
-    },
-}
+_ALL_CASES = [
+    (
+        "plain_simple",
+        {
+            "data": [
+                ["Sun", "696000", "1989100000"],
+                ["Earth", "6371", "5973.6"],
+                ["Moon", "1737", "73.5"],
+                ["Mars", "3390", "641.85"],
+            ],
+            "kwargs": {"tablefmt": "plain"},
+        },
+    ),
+    (
+        "simple_with_headers",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "simple"},
+        },
+    ),
+    (
+        "pipe_alignment",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {
+                "headers": "firstrow",
+                "tablefmt": "pipe",
+                "colalign": ("left", "right"),
+            },
+        },
+    ),
+    (
+        "grid_rowalign",
+        {
+            "data": [
+                ["Name", "Description"],
+                ["Mercury", "nearest\nplanet"],
+                ["Venus", "second\nplanet"],
+            ],
+            "kwargs": {"headers": "firstrow", "tablefmt": "grid", "rowalign": "bottom"},
+        },
+    ),
+    (
+        "github_multiline",
+        {
+            "data": [["Name", "Quote"], ["Alice", "Hello\nWorld"], ["Bob", "Hi"]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "github"},
+        },
+    ),
+    (
+        "orgtbl_numeric",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "orgtbl"},
+        },
+    ),
+    (
+        "psql_numbers",
+        {
+            "data": [["planet", "radius"], ["Mercury", 2440], ["Venus", 6052]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "psql"},
+        },
+    ),
+    (
+        "html_simple",
+        {
+            "data": [["Name", "Score"], ["Alice", 1], ["Bob", 2]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "html"},
+        },
+    ),
+    (
+        "unsafehtml_simple",
+        {
+            "data": [["Name", "Score"], ["<b>Alice</b>", 10], ["<i>Bob</i>", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "unsafehtml"},
+        },
+    ),
+    (
+        "latex_table",
+        {
+            "data": [["Planet", "Radius"], ["Mercury", 2440], ["Venus", 6052]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "latex"},
+        },
+    ),
+    (
+        "latex_booktabs",
+        {
+            "data": [["Planet", "Radius"], ["Mercury", 2440], ["Venus", 6052]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "latex_booktabs"},
+        },
+    ),
+    (
+        "grid_maxcolwidth",
+        {
+            "data": [
+                ["Name", "Description"],
+                ["Mercury", "Nearest planet to the Sun"],
+                ["Venus", "Has a thick atmosphere"],
+            ],
+            "kwargs": {
+                "headers": "firstrow",
+                "tablefmt": "grid",
+                "maxcolwidths": [None, 10],
+            },
+        },
+    ),
+    (
+        "grid_disable_numparse",
+        {
+            "data": [["Region", "Value"], ["EU", "42992e1"], ["US", "1000"]],
+            "kwargs": {
+                "headers": "firstrow",
+                "tablefmt": "grid",
+                "disable_numparse": [1],
+            },
+        },
+    ),
+    (
+        "pipe_rowalign_mixed",
+        {
+            "data": [
+                ["Name", "Description"],
+                ["Mercury", "nearest\nplanet"],
+                ["Venus", "second\nplanet"],
+            ],
+            "kwargs": {
+                "headers": "firstrow",
+                "tablefmt": "pipe",
+                "rowalign": ["top", "bottom"],
+            },
+        },
+    ),
+    (
+        "pipe_disable_numparse",
+        {
+            "data": [["Region", "Value"], ["EU", "42992e1"], ["US", "1000"]],
+            "kwargs": {
+                "headers": "firstrow",
+                "tablefmt": "pipe",
+                "disable_numparse": [1],
+            },
+        },
+    ),
+    (
+        "plain_showindex",
+        {
+            "data": [["Sun", "696000"], ["Earth", "6371"]],
+            "kwargs": {
+                "headers": "firstrow",
+                "tablefmt": "plain",
+                "showindex": "always",
+            },
+        },
+    ),
+    (
+        "plain_colglobal_right",
+        {
+            "data": [["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"tablefmt": "plain", "colalign": ("right", "right")},
+        },
+    ),
+    (
+        "ansi_plain",
+        {
+            "data": [
+                ["Name", "Value"],
+                ["\u001b[31mRed\u001b[0m", 10],
+                ["Plain", 5],
+            ],
+            "kwargs": {"headers": "firstrow", "tablefmt": "plain"},
+        },
+    ),
+    (
+        "wide_grid",
+        {
+            "data": [["Name", "Note"], ["寿司", "おいしい"], ["カレー", "辛い"]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "grid"},
+        },
+    ),
+    (
+        "plain_preserve_whitespace",
+        {
+            "data": [["Name", "Value"], ["  Alice", " 10"], ["Bob  ", "5"]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "plain"},
+        },
+    ),
+    (
+        "mediawiki_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "mediawiki"},
+        },
+    ),
+    (
+        "textile_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "textile"},
+        },
+    ),
+]
 
 
 Point = namedtuple("Point", "x y")
 
 
-@dataclass
+@dataclass(slots=True)
 class Person:
     name: str
     age: int
 
 
-CASES["namedtuple_keys_plain"] = {
-    "python_data": [Point(1, 2), Point(3, 4)],
-    "data_repr": [{"x": 1, "y": 2}, {"x": 3, "y": 4}],
-    "kwargs": {"headers": "keys", "tablefmt": "plain"},
-}
-
-CASES["dataclass_keys_plain"] = {
-    "python_data": [Person("Alice", 30), Person("Bob", 25)],
-    "data_repr": [{"name": "Alice", "age": 30}, {"name": "Bob", "age": 25}],
-    "kwargs": {"headers": "keys", "tablefmt": "plain"},
-}
-
-CASES["dict_iterables_mismatch_plain"] = {
-    "python_data": {
-        "name": ["Alice", "Bob", "Cara"],
-        "age": [30, 25],
-        "city": ["NYC", "Paris", "Berlin"],
-    },
-    "data_repr": [
-        {
-            "name": ["Alice", "Bob", "Cara"],
-            "age": [30, 25],
-            "city": ["NYC", "Paris", "Berlin"],
-        }
-    ],
-    "kwargs": {"headers": "keys", "tablefmt": "plain"},
-}
+_ALL_CASES.append(
+    (
+        "namedtuple_keys_plain",
+        {
+            "python_data": [Point(1, 2), Point(3, 4)],
+            "data_repr": [{"x": 1, "y": 2}, {"x": 3, "y": 4}],
+            "kwargs": {"headers": "keys", "tablefmt": "plain"},
+        },
+    )
+)
+
+_ALL_CASES.append(
+    (
+        "dataclass_keys_plain",
+        {
+            "python_data": [Person("Alice", 30), Person("Bob", 25)],
+            "data_repr": [{"name": "Alice", "age": 30}, {"name": "Bob", "age": 25}],
+            "kwargs": {"headers": "keys", "tablefmt": "plain"},
+        },
+    )
+)
+
+_ALL_CASES.append(
+    (
+        "dict_iterables_mismatch_plain",
+        {
+            "python_data": {
+                "name": ["Alice", "Bob", "Cara"],
+                "age": [30, 25],
+                "city": ["NYC", "Paris", "Berlin"],
+            },
+            "data_repr": [
+                {
+                    "name": ["Alice", "Bob", "Cara"],
+                    "age": [30, 25],
+                    "city": ["NYC", "Paris", "Berlin"],
+                }
+            ],
+            "kwargs": {"headers": "keys", "tablefmt": "plain"},
+        },
+    )
+)
+
+
+_JSON_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
 
 
 def to_json_value(value):
+    # Exact-type lookup first; subclasses (e.g. numpy.float64) fall through.
+    if type(value) in _JSON_SCALAR_TYPES:
+        return value
+    # Before the isinstance check below: numpy.float64 and numpy.str_ subclass
+    # float and str but must still be unwrapped for orjson.
+    if isinstance(value, _NUMPY_SCALAR):
+        return value.item()
     if isinstance(value, (str, int, float, bool)) or value is None:
         return value
     if hasattr(value, "item"):
         return value.item()
     if isinstance(value, (list, tuple)):
-        return [to_json_value(v) for v in value]
+        return _sequence_to_json(value)
     return str(value)
 
 
-if pd is not None:
+def _sequence_to_json(sequence):
+    # Walk nested lists/tuples with an explicit work list instead of recursing,
+    # filling preallocated output lists in place. Each item carries the ids of
+    # its enclosing containers, so a cycle raises instead of looping forever;
+    # the same list appearing twice elsewhere is fine.
+    result = [None] * len(sequence)
+    pending = deque([(sequence, result, frozenset({id(sequence)}))])
+    while pending:
+        source, target, ancestors = pending.popleft()
+        for position, value in enumerate(source):
+            if type(value) in _JSON_SCALAR_TYPES:
+                target[position] = value
+            elif isinstance(value, (list, tuple)) and not hasattr(value, "item"):
+                if id(value) in ancestors:
+                    raise ValueError("cannot convert a self-referencing list/tuple")
+                nested = [None] * len(value)
+                target[position] = nested
+                pending.append((value, nested, ancestors | {id(value)}))
+            else:
+                target[position] = to_json_value(value)
+    return result
+
+
+if find_spec("pandas") is not None and wanted(*PANDAS_CASES) and _ensure_pandas():
 
     def dataframe_repr(df, *, include_index=True):
-        data = [[to_json_value(v) for v in row] for row in df.to_numpy().tolist()]
+        # Extract column by column so plain numpy bool/int/float columns keep
+        # their dtype (and convert to Python scalars in one ``tolist`` call)
+        # instead of being upcast to object by ``df.to_numpy()``. Complex and
+        # extension dtypes (e.g. nullable Int64) go through to_json_value.
+        column_values = []
+        for position, dtype in enumerate(df.dtypes):
+            column = df.iloc[:, position]
+            if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+                values = column.to_numpy().tolist()
+            else:
+                values = [to_json_value(v) for v in column.to_numpy(dtype=object)]
+            column_values.append(values)
+        if column_values:
+            data = [list(row) for row in zip(*column_values)]
+        else:
+            data = [[] for _ in range(len(df.index))]
         columns = [to_json_value(col) for col in df.columns.tolist()]
         index = None
         index_label = None
         if include_index:
-            index_values = []
-            for value in df.index.tolist():
-                if isinstance(value, tuple):
-                    index_values.append(str(tuple(value)))
-                else:
-                    index_values.append(to_json_value(value))
-            index = index_values
+            if isinstance(df.index, pd.MultiIndex):
+                # str() of each tuple, as tabulate renders MultiIndex rows.
+                # Joining repr()s by hand is slower and drops the trailing
+                # comma of one-level tuples.
+                index = list(map(str, df.index.to_flat_index().tolist()))
+            else:
+                # A flat Index can still hold tuples (tupleize_cols=False).
+                index = [
+                    str(v) if isinstance(v, tuple) else to_json_value(v)
+                    for v in df.index.tolist()
+                ]
             index_names = [name for name in (df.index.names or []) if name is not None]
             if index_names:
                 if len(index_names) == 1:
@@ -233,6 +429,9 @@ if pd is not None:
             result["index_label"] = index_label
         return result
 
+    # python_data stays the DataFrame itself rather than rows derived from
+    # data_repr: these cases snapshot tabulate's own DataFrame handling
+    # (column keys, index column), which pre-converted rows would bypass.
     multi_index = pd.MultiIndex.from_product(
         [["foo", "bar"], ["one", "two"]], names=("first", "second")
     )
@@ -243,142 +442,318 @@ if pd is not None:
         },
         index=multi_index,
     )
-    CASES["dataframe_multiindex_grid"] = {
-        "python_data": multi_df,
-        "data_repr": [dataframe_repr(multi_df)],
-        "kwargs": {"headers": "keys", "tablefmt": "grid"},
-    }
+    _ALL_CASES.append(
+        (
+            "dataframe_multiindex_grid",
+            {
+                "python_data": multi_df,
+                "data_repr": [dataframe_repr(multi_df)],
+                "kwargs": {"headers": "keys", "tablefmt": "grid"},
+            },
+        )
+    )
 
     simple_df = pd.DataFrame(
         {"name": ["Alice", "Bob"], "score": [10, 20]},
         index=pd.Index(["row 1", "row 2"], name="id"),
     )
-    CASES["dataframe_index_label_plain"] = {
-        "python_data": simple_df,
-        "data_repr": [dataframe_repr(simple_df)],
-        "kwargs": {"headers": "keys", "tablefmt": "plain"},
-    }
+    _ALL_CASES.append(
+        (
+            "dataframe_index_label_plain",
+            {
+                "python_data": simple_df,
+                "data_repr": [dataframe_repr(simple_df)],
+                "kwargs": {"headers": "keys", "tablefmt": "plain"},
+            },
+        )
+    )
 
-if np is not None:
+if find_spec("numpy") is not None and wanted(*NUMPY_CASES) and _ensure_numpy():
     ndarray = np.array([[1, 2], [3, 4]])
-    CASES["numpy_array_plain"] = {
-        "python_data": ndarray,
-        "data_repr": ndarray.tolist(),
-        "kwargs": {"tablefmt": "plain"},
-    }
+    _ALL_CASES.append(
+        (
+            "numpy_array_plain",
+            {
+                "python_data": ndarray,
+                "data_repr": ndarray.tolist(),
+                "kwargs": {"tablefmt": "plain"},
+            },
+        )
+    )
 
     rec_array = np.array(
         [(1, "Alice"), (2, "Bob")], dtype=[("id", "i4"), ("name", "U10")]
     )
-    CASES["numpy_recarray_keys_plain"] = {
-        "python_data": rec_array,
-        "data_repr": [
+    _ALL_CASES.append(
+        (
+            "numpy_recarray_keys_plain",
             {
-                "__tabulate_numpy_recarray__": True,
-                "dtype": [("id", "i4"), ("name", "U10")],
-                "rows": rec_array.tolist(),
-            }
-        ],
-        "kwargs": {"headers": "keys", "tablefmt": "plain"},
-    }
-
-EXTRA_CASES = {
-    "latex_raw_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "latex_raw"},
-    },
-    "latex_raw_colalign": {
-        "data": [["Name", "Value"], ["Alice", "42992e1"], ["Bob", "1000"]],
-        "kwargs": {
-            "headers": "firstrow",
-            "tablefmt": "latex_raw",
-            "colalign": ("right", "left"),
-        },
-    },
-    "latex_longtable_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "latex_longtable"},
-    },
-    "pretty_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "pretty"},
-    },
-    "presto_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "presto"},
-    },
-    "colon_grid_alignment": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {
-            "headers": "firstrow",
-            "tablefmt": "colon_grid",
-            "colalign": ("left", "right"),
-        },
-    },
-    "simple_outline_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "simple_outline"},
-    },
-    "rounded_outline_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "rounded_outline"},
-    },
-    "heavy_outline_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "heavy_outline"},
-    },
-    "mixed_outline_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "mixed_outline"},
-    },
-    "double_outline_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "double_outline"},
-    },
-    "fancy_outline_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "fancy_outline"},
-    },
-    "tsv_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "tsv"},
-    },
-    "moinmoin_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "moinmoin"},
-    },
-    "youtrack_basic": {
-        "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "youtrack"},
-    },
-    "disable_numparse_mixed": {
-        "data": [["Value"], ["42992e1"], ["100"]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "plain", "disable_numparse": [0]},
-    },
-    "maxheadercolwidths_scalar": {
-        "data": [["VeryLongHeader", "Short"], ["1", "2"]],
-        "kwargs": {"headers": "firstrow", "tablefmt": "grid", "maxheadercolwidths": 6},
-    },
-}
-
-CASES.update(EXTRA_CASES)
-
-
-snapshots = {}
-for name, case in CASES.items():
-    python_data = case.get("python_data", case.get("data"))
-    if python_data is None:
-        raise ValueError(f"case '{name}' is missing python data")
-    kwargs = case["kwargs"]
-    output = tabulate(python_data, **kwargs)
-    snapshots[name] = {
-        "data": case.get("data_repr", case.get("data")),
-        "kwargs": to_json_kwargs(kwargs),
-        "output": output,
-    }
+                "python_data": rec_array,
+                "data_repr": [
+                    {
+                        "__tabulate_numpy_recarray__": True,
+                        "dtype": [("id", "i4"), ("name", "U10")],
+                        "rows": rec_array.tolist(),
+                    }
+                ],
+                "kwargs": {"headers": "keys", "tablefmt": "plain"},
+            },
+        )
+    )
+
+_ALL_CASES += [
+    (
+        "latex_raw_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "latex_raw"},
+        },
+    ),
+    (
+        "latex_raw_colalign",
+        {
+            "data": [["Name", "Value"], ["Alice", "42992e1"], ["Bob", "1000"]],
+            "kwargs": {
+                "headers": "firstrow",
+                "tablefmt": "latex_raw",
+                "colalign": ("right", "left"),
+            },
+        },
+    ),
+    (
+        "latex_longtable_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "latex_longtable"},
+        },
+    ),
+    (
+        "pretty_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "pretty"},
+        },
+    ),
+    (
+        "presto_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "presto"},
+        },
+    ),
+    (
+        "colon_grid_alignment",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {
+                "headers": "firstrow",
+                "tablefmt": "colon_grid",
+                "colalign": ("left", "right"),
+            },
+        },
+    ),
+    (
+        "simple_outline_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "simple_outline"},
+        },
+    ),
+    (
+        "rounded_outline_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "rounded_outline"},
+        },
+    ),
+    (
+        "heavy_outline_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "heavy_outline"},
+        },
+    ),
+    (
+        "mixed_outline_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "mixed_outline"},
+        },
+    ),
+    (
+        "double_outline_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "double_outline"},
+        },
+    ),
+    (
+        "fancy_outline_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "fancy_outline"},
+        },
+    ),
+    (
+        "tsv_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "tsv"},
+        },
+    ),
+    (
+        "moinmoin_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "moinmoin"},
+        },
+    ),
+    (
+        "youtrack_basic",
+        {
+            "data": [["Name", "Score"], ["Alice", 10], ["Bob", 1000]],
+            "kwargs": {"headers": "firstrow", "tablefmt": "youtrack"},
+        },
+    ),
+    (
+        "disable_numparse_mixed",
+        {
+            "data": [["Value"], ["42992e1"], ["100"]],
+            "kwargs": {
+                "headers": "firstrow",
+                "tablefmt": "plain",
+                "disable_numparse": [0],
+            },
+        },
+    ),
+    (
+        "maxheadercolwidths_scalar",
+        {
+            "data": [["VeryLongHeader", "Short"], ["1", "2"]],
+            "kwargs": {
+                "headers": "firstrow",
+                "tablefmt": "grid",
+                "maxheadercolwidths": 6,
+            },
+        },
+    ),
+]
+
+# Cases are collected in fixture order and turned into a dict in one pass;
+# dict() would silently keep only the last of two cases with the same name.
+CASES = dict(_ALL_CASES)
+if len(CASES) != len(_ALL_CASES):
+    raise ValueError("duplicate snapshot case names")
+
+if WANTED is not None:
+    CASES = {name: case for name, case in CASES.items() if name in WANTED}
+
+
+# Resolve the tabulate input and the fixture "data" value once, so the render
+# loop does a single lookup for each.
+for case in CASES.values():
+    case["_input"] = case.get("python_data", case.get("data"))
+    case["_repr"] = case.get("data_repr", case.get("data"))
+
+
+def render_case(item):
+    name, case = item
+    return name, tabulate(case["_input"], **case["kwargs"])
+
+
+_INT_RANGE = range(-(2**63), 2**64)
+
+
+def _check_json(value):
+    # Reject what orjson and json would encode differently, so the fixture
+    # does not depend on which serialiser is installed: NaN/inf, floats whose
+    # repr uses an exponent (orjson writes 1e-7, json 1e-07), ints beyond 64
+    # bits and non-str keys. Only exact JSON types and str subclasses pass;
+    # list, tuple and int subclasses (namedtuple, IntEnum) are rejected too,
+    # even where both serialisers would agree.
+    pending = [value]
+    while pending:
+        value = pending.pop()
+        kind = type(value)
+        if kind in (list, tuple):
+            pending.extend(value)
+        elif kind is dict:
+            for key in value:
+                if type(key) is not str:
+                    raise TypeError(f"non-str JSON key: {key!r}")
+            pending.extend(value.values())
+        elif kind is float:
+            if not math.isfinite(value):
+                raise ValueError(f"non-finite float in JSON data: {value!r}")
+            if "e" in repr(value):
+                raise ValueError(f"exponent-form float in JSON data: {value!r}")
+        elif kind is int:
+            if value not in _INT_RANGE:
+                raise ValueError(f"int out of 64-bit range in JSON data: {value}")
+        elif kind not in _JSON_SCALAR_TYPES and not isinstance(value, str):
+            raise TypeError(f"unsupported JSON value type: {kind.__name__}")
+
+
+def dump_json(value):
+    _check_json(value)
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+    return json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def main():
+    fixture = pathlib.Path("tests/fixtures/python_snapshots.json")
+    if WANTED is not None:
+        requires = dict.fromkeys(PANDAS_CASES, "pandas")
+        requires.update(dict.fromkeys(NUMPY_CASES, "numpy"))
+        problems = [
+            (
+                f"{name} (requires {requires[name]}, which could not be imported)"
+                if name in requires
+                else f"{name} (unknown case)"
+            )
+            for name in sorted(WANTED - CASES.keys())
+        ]
+        if problems:
+            raise ValueError(
+                "cannot regenerate SNAPSHOT_FILTER case(s): " + ", ".join(problems)
+            )
+        # A filtered run merges into the existing fixture; writing only the
+        # selected cases would drop every other snapshot.
+        if not fixture.exists():
+            raise FileNotFoundError(
+                f"SNAPSHOT_FILTER needs an existing {fixture}; "
+                "run without it to generate the full fixture"
+            )
+    for name, case in CASES.items():
+        if case["_input"] is None:
+            raise ValueError(f"case '{name}' is missing python data")
+
+    # Render cases grouped by table format so calls sharing a format run back
+    # to back. Rendering is serial: all cases take a few milliseconds, far less
+    # than starting worker processes. The format is still passed by name:
+    # tabulate special-cases some names (e.g. "pretty", multiline formats), so
+    # a resolved TableFormat would change the output. Snapshots are written in
+    # CASES order regardless.
+    ordered = sorted(
+        CASES.items(), key=lambda item: item[1]["kwargs"].get("tablefmt", "simple")
+    )
+    outputs = dict(map(render_case, ordered))
+
+    # A filtered run only replaces the selected entries of the existing fixture.
+    snapshots = {}
+    if WANTED is not None:
+        snapshots = json.loads(fixture.read_bytes())
+    for name, case in CASES.items():
+        snapshots[name] = {
+            "data": case["_repr"],
+            "kwargs": to_json_kwargs(case["kwargs"]),
+            "output": outputs[name],
+        }
+
+    fixture.parent.mkdir(parents=True, exist_ok=True)
+    fixture.write_bytes(dump_json(snapshots))
 
-import pathlib
 
-pathlib.Path("tests/fixtures").mkdir(parents=True, exist_ok=True)
-with open("tests/fixtures/python_snapshots.json", "w", encoding="utf-8") as f:
-    json.dump(snapshots, f, indent=2, ensure_ascii=False)
+if __name__ == "__main__":
+    main()